@@ -1,31 +1,53 @@
 # app_ui.py
 import gradio as gr
+import logging
 import time
 import pandas as pd
-from typing import Generator, Any, List, Callable
+from datetime import datetime
+from functools import partial
+from typing import Generator, Any, List, Callable, Tuple, Dict
 from config import LLM_CONFIG, SUPPORTED_SEARCH_ENGINES, PRESET_COINS, FONT_PATH
-from core.search_engine import get_search_engines
+from core.search_engine import get_search_engines, SearchResult
 from core.selenium_crawler import SeleniumCrawler
-from core.llm_service import LLMService
+from core.llm_service import LLMService, estimate_tokens, SENTIMENT_ARTICLE_OVERHEAD_TOKENS
 from core.data_handler import DataHandler
-from core.output_formatter import format_summary_for_display, format_raw_data_for_display
-from core.analysis import analyze_sentiment_simple, generate_word_cloud, create_sentiment_pie_chart
+from core.output_formatter import (format_summary_for_display, format_raw_data_for_display,
+                                   format_index_hits_for_display, format_records_for_display, build_display_record)
+from core.analysis import (analyze_sentiment_simple, score_sentiment_simple, extract_financial_terms,
+                           generate_word_cloud_from_terms, create_sentiment_pie_chart, create_sentiment_trend_chart)
+from core.corpus import ArticleCorpus
+from core.pipeline import Pipeline
+from core.sentiment_timeseries import SentimentTimeSeries, normalize_series_key
+from core.search_index import ArticleIndex
 
 data_handler = DataHandler()
+sentiment_series = SentimentTimeSeries(data_handler.output_dir)
+article_index = ArticleIndex(data_handler.output_dir)
+
+# 流水线各阶段之间队列的容量，限制在途条目数量以控制内存
+PIPELINE_QUEUE_SIZE = 16
+# 大模型逐篇情绪：每批最多文章数，以及自一批首篇文章到达起等待凑批的最长秒数。
+# 单页爬取约需3秒等待加上页面加载时间，凑满一批约需一到两分钟；上游爬取结束时不足一批也会立即提交
+LLM_SENTIMENT_BATCH_SIZE = 20
+LLM_SENTIMENT_BATCH_WAIT = 120.0
+# 每篇送入大模型的摘录长度；token预算按中文每字约1个token估算，保证一整批文章能装进同一个请求
+LLM_SENTIMENT_EXCERPT_CHARS = 400
+LLM_SENTIMENT_TOKEN_BUDGET = LLM_SENTIMENT_BATCH_SIZE * (LLM_SENTIMENT_EXCERPT_CHARS + 1 + SENTIMENT_ARTICLE_OVERHEAD_TOKENS)
 
 
 def search_and_crawl_flow(api_key: str, base_url: str, model_name: str, search_engine_names: List[str],
                           time_period: str, query: str, search_count: float, crawl_count: float,
-                          is_direct_crawl: bool = False) -> Generator[Any, None, None]:
+                          llm_sentiment: bool = False, is_direct_crawl: bool = False) -> Generator[Any, None, None]:
     yield from unified_task_processor(
         api_key=api_key, base_url=base_url, model_name=model_name,
         search_engine_names=search_engine_names, time_period=time_period, query=query,
         search_count=search_count, crawl_count=crawl_count, is_direct_crawl=is_direct_crawl,
-        url_list=None
+        llm_sentiment=llm_sentiment, url_list=None
     )
 
 
-def targeted_crawl_flow(api_key: str, base_url: str, model_name: str, url_list_str: str) -> Generator[Any, None, None]:
+def targeted_crawl_flow(api_key: str, base_url: str, model_name: str, url_list_str: str,
+                        llm_sentiment: bool = False) -> Generator[Any, None, None]:
     urls = [url.strip() for url in url_list_str.splitlines() if url.strip()]
     if not urls:
         yield "错误：URL列表不能为空。", "无", format_raw_data_for_display([]), None, None, gr.Button(
@@ -33,130 +55,260 @@ def targeted_crawl_flow(api_key: str, base_url: str, model_name: str, url_list_s
         return
     yield from unified_task_processor(
         api_key=api_key, base_url=base_url, model_name=model_name,
-        crawl_count=len(urls), url_list=urls, query="Targeted Crawl"
+        crawl_count=len(urls), url_list=urls, query="Targeted Crawl", llm_sentiment=llm_sentiment
     )
 
 
+def sentiment_trend_flow(series_key: str, granularity_label: str, days: float) -> Tuple[Any, str]:
+    series_key = normalize_series_key(series_key)
+    if not series_key:
+        return None, "请输入币种或关键词。"
+    granularity = "hour" if granularity_label == "按小时" else "day"
+    days = float(days or 30)
+    started = time.perf_counter()
+    buckets, means, counts = sentiment_series.query(series_key, days=days, granularity=granularity)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    chart = create_sentiment_trend_chart(buckets, means, counts, title=f"{series_key} sentiment ({granularity_label})")
+    if len(counts) == 0:
+        return chart, f"**{series_key}** 在最近 {days:g} 天内暂无情绪记录。"
+    overall = float((means * counts).sum() / counts.sum())
+    return chart, (f"**{series_key}** 最近 {days:g} 天共 {int(counts.sum())} 篇文章，"
+                   f"平均情绪 {overall:+.2f}（查询耗时 {elapsed_ms:.1f} ms）")
+
+
+def index_search_flow(query: str, limit: float) -> Tuple[pd.DataFrame, str]:
+    if not query or not query.strip():
+        return format_index_hits_for_display([]), "请输入检索关键词。"
+    started = time.perf_counter()
+    hits = article_index.search(query, limit=int(limit or 20))
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    return format_index_hits_for_display(hits), (f"在 {article_index.count()} 篇已收录文章中找到 {len(hits)} 条结果"
+                                                 f"（耗时 {elapsed_ms:.1f} ms）")
+
+
+def index_analysis_flow(api_key: str, base_url: str, model_name: str, query: str,
+                        limit: float) -> Generator[Any, None, None]:
+    """基于本地索引的检索结果运行情绪、词云与大模型总结，不发起任何网络抓取。"""
+    status, summary = "正在检索本地语料...", "等待分析结果..."
+    pie_chart, word_cloud = None, None
+    hits = article_index.search(query, limit=int(limit or 20)) if query and query.strip() else []
+    dataframe = format_index_hits_for_display(hits)
+
+    def yield_state(interactive: bool):
+        buttons = tuple(gr.Button(interactive=interactive) for _ in range(2 + len(PRESET_COINS)))
+        return (status, summary, dataframe, pie_chart, word_cloud) + buttons
+
+    yield yield_state(False)
+    if not hits:
+        status = "本地索引中没有匹配的文章。"
+        yield yield_state(True)
+        return
+
+    links = [hit["link"] for hit in hits]
+    status = "正在生成可视化图表..."
+    yield yield_state(False)
+    pie_chart = create_sentiment_pie_chart([hit["sentiment"] for hit in hits])
+    cloud_terms = [term for _, content in article_index.iter_contents(links)
+                   for term in extract_financial_terms(content)]
+    word_cloud = generate_word_cloud_from_terms(cloud_terms, FONT_PATH)
+
+    if api_key and api_key != "YOUR_API_KEY_HERE":
+        status = "正在调用大模型进行总结..."
+        yield yield_state(False)
+        llm_service = LLMService(api_key, base_url if base_url else None, model_name)
+        contents = (content for _, content in article_index.iter_contents(links))
+        summary = format_summary_for_display(llm_service.summarize_news(contents, query), links)
+    else:
+        summary = "已跳过大模型分析。"
+
+    status = "任务完成！"
+    yield yield_state(True)
+
+
 def unified_task_processor(**kwargs) -> Generator[Any, None, None]:
+    """
+    以流水线方式执行 搜索 -> 爬取 -> 分析：首批搜索结果到达即开始爬取，每篇网页到达即进行情绪与词频分析，
+    阶段之间通过有界队列衔接。
+    """
     status, summary = "正在启动任务...", "等待分析结果..."
-    dataframe = format_raw_data_for_display([])
+    records: List[Dict] = []
     pie_chart, word_cloud = None, None
-    analyze_btn = gr.Button(interactive=False)
-    targeted_btn = gr.Button(interactive=False)
-    preset_btns = [gr.Button(interactive=False) for _ in PRESET_COINS]
+    buttons_interactive = False
 
-    def yield_state(df_override: pd.DataFrame = None):
-        display_df = df_override if df_override is not None else dataframe
-        outputs = (status, summary, display_df, pie_chart, word_cloud, analyze_btn, targeted_btn) + tuple(preset_btns)
-        return outputs
+    def yield_state():
+        buttons = tuple(gr.Button(interactive=buttons_interactive) for _ in range(2 + len(PRESET_COINS)))
+        return (status, summary, format_records_for_display(records), pie_chart, word_cloud) + buttons
 
     crawler = SeleniumCrawler()
     if not crawler.driver:
         status = "错误: Selenium WebDriver未能启动。"
         summary = "请确保在 config.py 中设置的 'WEBDRIVER_PATH' 路径正确，且驱动版本与Chrome浏览器匹配。"
-        analyze_btn = gr.Button(interactive=True)
-        targeted_btn = gr.Button(interactive=True)
-        preset_btns = [gr.Button(interactive=True) for _ in PRESET_COINS]
+        buttons_interactive = True
         yield yield_state()
         return
 
     yield yield_state()
 
+    query = kwargs.get('query', '')
+    crawl_count = int(kwargs.get('crawl_count', 5))
+    pipeline = Pipeline(maxsize=PIPELINE_QUEUE_SIZE)
     url_list = kwargs.get('url_list')
     if url_list:
-        search_results = [type('obj', (object,), {'link': url, 'title': f'指定网址 {i + 1}', 'source': '用户指定'}) for
-                          i, url in enumerate(url_list)]
+        targets = [SearchResult(f'指定网址 {i + 1}', url, "", '用户指定', datetime.now()) for i, url in enumerate(url_list)]
+        pipeline.source(lambda: targets)
+        status = "正在爬取指定网页..."
     else:
         search_engine_names = kwargs.get('search_engine_names', [])
         if not search_engine_names:
             status = "错误：请至少选择一个搜索引擎。"
-            analyze_btn = gr.Button(interactive=True);
-            preset_btns = [gr.Button(interactive=True) for _ in PRESET_COINS]
-            yield yield_state();
-            crawler.close();
+            buttons_interactive = True
+            yield yield_state()
+            crawler.close()
             return
 
         search_count = int(kwargs.get('search_count', 10))
-        crawl_count = int(kwargs.get('crawl_count', 5))
+        adjust_note = ""
         if crawl_count > search_count * len(search_engine_names):
             search_count = crawl_count // len(search_engine_names) + 1
-            status = f"提示：为满足爬取数量，已自动将各引擎搜索数量调整为 {search_count}"
-            yield yield_state();
-            time.sleep(2)
+            adjust_note = f"（为满足爬取数量，已自动将各引擎搜索数量调整为 {search_count}）"
 
-        status = f"正在使用 {', '.join(search_engine_names)} 进行搜索..."
-        yield yield_state()
-        search_engines = get_search_engines(search_engine_names)
-        all_search_results = []
-        for engine in search_engines:
-            all_search_results.extend(
-                engine.search(kwargs.get('query'), time_period=kwargs.get('time_period'), max_results=search_count))
-
-        unique_links = set()
-        search_results = [res for res in all_search_results if
-                          res.link not in unique_links and not unique_links.add(res.link)]
-        if not search_results:
+        for engine in get_search_engines(search_engine_names):
+            pipeline.source(partial(engine.search, query, time_period=kwargs.get('time_period'),
+                                    max_results=search_count))
+        status = f"正在使用 {', '.join(search_engine_names)} 进行搜索{adjust_note}..."
+    yield yield_state()
+
+    # 指定网址模式没有真实的关键词，不计入情绪时间序列
+    series_key = "" if url_list else normalize_series_key(query)
+    seen_links, links_to_crawl = set(), []
+    # 正文写入磁盘上的语料库，内存中只保留预览与统计信息
+    with ArticleCorpus() as corpus:
+        llm_service = None
+        api_key = kwargs.get('api_key')
+        if kwargs.get('llm_sentiment') and api_key and api_key != "YOUR_API_KEY_HERE":
+            llm_service = LLMService(api_key, kwargs.get('base_url') if kwargs.get('base_url') else None,
+                                     kwargs.get('model_name'))
+
+        def select(result: SearchResult) -> List[SearchResult]:
+            # 所有去重后的结果都进入表格，仅前 crawl_count 条送去爬取
+            if result.link in seen_links: return []
+            seen_links.add(result.link)
+            pipeline.emit(("found", result))
+            if len(links_to_crawl) >= crawl_count: return []
+            links_to_crawl.append(result.link)
+            return [result]
+
+        def crawl(result: SearchResult) -> List[Tuple[SearchResult, bool, str]]:
+            pipeline.emit(("crawling", result))
+            success, content_or_error = crawler.extract_content(result.link)
+            return [(result, success, content_or_error)]
+
+        def analyze(item: Tuple[SearchResult, bool, str]) -> List[SearchResult]:
+            result, success, content_or_error = item
+            if not success:
+                pipeline.emit(("failed", result, content_or_error))
+                return []
+            try:
+                sentiment = analyze_sentiment_simple(content_or_error)
+                terms = extract_financial_terms(content_or_error)
+                if not llm_service:
+                    sentiment_series.record(series_key, score_sentiment_simple(content_or_error), timestamp=result.date,
+                                            link=result.link)
+                article_index.add_article(result.link, result.title, result.source, result.to_dict()['date'], sentiment,
+                                          content_or_error)
+                article = corpus.add(result.link, result.title, content_or_error, sentiment,
+                                     estimate_tokens(content_or_error))
+            except Exception as e:
+                # 确保表格中该行有最终状态，进度计数也能走完
+                logging.error(f"分析 {result.link} 时发生错误: {e}", exc_info=True)
+                pipeline.emit(("failed", result, f"分析失败: {type(e).__name__}"))
+                return []
+            pipeline.emit(("analyzed", result, article, terms))
+            return [result]
+
+        def classify(batch: List[SearchResult]) -> List[Any]:
+            # 多篇文章打包为一次大模型请求，词典标签在此之前已作为临时结果展示
+            labels = llm_service.classify_sentiments([corpus.text(result.link) for result in batch],
+                                                     token_budget=LLM_SENTIMENT_TOKEN_BUDGET,
+                                                     max_article_chars=LLM_SENTIMENT_EXCERPT_CHARS)
+            for result, (label, score) in zip(batch, labels):
+                corpus.set_sentiment(result.link, label)
+                sentiment_series.record(series_key, score, timestamp=result.date, link=result.link)
+                article_index.update_sentiment(result.link, label)
+                pipeline.emit(("llm_sentiment", result, label))
+            return []
+
+        # Selenium驱动不支持并发访问，爬取阶段保持单线程；
+        # 分析阶段写入的索引、时间序列和语料库各自持有锁，可多线程并行；
+        # 凑批阶段只用一个线程，避免多个线程各自攒出半批，打包后的请求由 classify_sentiments 并发发送
+        pipeline.stage(select).stage(crawl).stage(analyze, workers=2)
+        if llm_service:
+            pipeline.stage(classify, batch_size=LLM_SENTIMENT_BATCH_SIZE, batch_wait=LLM_SENTIMENT_BATCH_WAIT)
+
+        cloud_terms = []
+        record_by_link: Dict[str, Dict] = {}
+        crawled = 0
+        try:
+            pipeline.start()
+            for event in pipeline:
+                kind, result = event[0], event[1]
+                if kind == "found":
+                    record = build_display_record(len(records), result)
+                    records.append(record)
+                    record_by_link[result.link] = record
+                elif kind == "crawling":
+                    record_by_link[result.link]['爬取状态'] = "爬取中"
+                elif kind == "failed":
+                    crawled += 1
+                    record_by_link[result.link]['爬取状态'] = f"失败: {event[2]}"
+                elif kind == "analyzed":
+                    crawled += 1
+                    _, _, article, terms = event
+                    record_by_link[result.link].update({'爬取状态': "成功", '爬取内容': article.preview,
+                                                        '情绪': article.sentiment})
+                    cloud_terms.extend(terms)
+                elif kind == "llm_sentiment":
+                    record_by_link[result.link]['情绪'] = event[2]
+                status = f"已找到 {len(records)} 条结果，已爬取 {crawled}/{min(crawl_count, len(records))} 个网页..."
+                yield yield_state()
+        finally:
+            pipeline.close()
+            crawler.close()
+            # 任务中止或出错时也持久化已记录的增量，避免聚合结果与记录日志不一致
+            sentiment_series.save()
+
+        if not records:
             status = "未能找到相关结果。"
-            analyze_btn = gr.Button(interactive=True);
-            preset_btns = [gr.Button(interactive=True) for _ in PRESET_COINS]
-            yield yield_state();
-            crawler.close();
+            buttons_interactive = True
+            yield yield_state()
             return
 
-    dataframe = format_raw_data_for_display(search_results)
-    status = "搜索完成，正在爬取网页..."
-    yield yield_state()
+        if len(corpus):
+            status = "正在生成可视化图表..."
+            yield yield_state()
+            pie_chart = create_sentiment_pie_chart([article.sentiment for article in corpus.summaries()])
+            word_cloud = generate_word_cloud_from_terms(cloud_terms, FONT_PATH)
+            yield yield_state()
 
-    full_content, sentiments = "", []
-    links_to_crawl = search_results[:int(kwargs.get('crawl_count', 5))]
-
-    for i, result in enumerate(links_to_crawl):
-        df_index = dataframe[dataframe['链接'] == result.link].index
-        if df_index.empty: continue
-        status = f"正在爬取第 {i + 1}/{len(links_to_crawl)} 个网页..."
-        yield yield_state()
-        success, content_or_error = crawler.extract_content(result.link)
-        dataframe.loc[df_index, '爬取状态'] = "成功" if success else f"失败: {content_or_error}"
-        if success:
-            dataframe.loc[df_index, '爬取内容'] = content_or_error
-            full_content += content_or_error + "\n"
-            sentiment = analyze_sentiment_simple(content_or_error)
-            sentiments.append(sentiment)
-            dataframe.loc[df_index, '情绪'] = sentiment
-
-        display_dataframe = dataframe.copy()
-        display_dataframe['爬取内容'] = display_dataframe['爬取内容'].str.slice(0, 150) + '...'
-        yield yield_state(df_override=display_dataframe)
-        time.sleep(0.2)
-
-    if full_content:
-        status = "正在生成可视化图表..."
-        yield yield_state()
-        pie_chart = create_sentiment_pie_chart(sentiments)
-        word_cloud = generate_word_cloud(full_content, FONT_PATH)
+        data_handler.save_to_csv(records, query or 'task', corpus=corpus)
+        status = "数据已保存，正在完成最后步骤..."
         yield yield_state()
 
-    data_handler.save_to_csv(dataframe.to_dict('records'), kwargs.get('query', 'task'))
-    status = "数据已保存，正在完成最后步骤..."
-    yield yield_state()
-
-    if not kwargs.get('url_list') and not kwargs.get('is_direct_crawl') and kwargs.get('api_key') and kwargs.get(
-            'api_key') != "YOUR_API_KEY_HERE" and full_content:
-        status = "正在调用大模型进行总结..."
+        if not url_list and not kwargs.get('is_direct_crawl') and kwargs.get('api_key') and kwargs.get(
+                'api_key') != "YOUR_API_KEY_HERE" and len(corpus):
+            status = "正在调用大模型进行总结..."
+            yield yield_state()
+            llm_service = llm_service or LLMService(kwargs.get('api_key'),
+                                                    kwargs.get('base_url') if kwargs.get('base_url') else None,
+                                                    kwargs.get('model_name'))
+            summary = format_summary_for_display(llm_service.summarize_news(corpus.iter_texts(), query),
+                                                 links_to_crawl)
+        else:
+            summary = "已跳过大模型分析。"
+
+        status = "任务完成！"
+        buttons_interactive = True
         yield yield_state()
-        llm_service = LLMService(kwargs.get('api_key'), kwargs.get('base_url') if kwargs.get('base_url') else None,
-                                 kwargs.get('model_name'))
-        summary = format_summary_for_display(llm_service.summarize_news(full_content, kwargs.get('query')),
-                                             [res.link for res in links_to_crawl])
-    else:
-        summary = "已跳过大模型分析。"
-
-    status = "任务完成！"
-    analyze_btn = gr.Button(interactive=True)
-    targeted_btn = gr.Button(interactive=True)
-    preset_btns = [gr.Button(interactive=True) for _ in PRESET_COINS]
-    yield yield_state()
-    crawler.close()
 
 
 def create_ui():
@@ -169,6 +321,8 @@ def create_ui():
                                            scale=2)
                 base_url_input = gr.Textbox(label="API Base URL (可选)", value=LLM_CONFIG["base_url"] or "", scale=2)
                 model_name_input = gr.Textbox(label="模型名称", value=LLM_CONFIG["model_name"], scale=1)
+            llm_sentiment_input = gr.Checkbox(label="使用大模型逐篇判断情绪（批量请求，失败时回退到词典评分）",
+                                              value=False)
 
         with gr.Row(equal_height=False):
             with gr.Column(scale=4):
@@ -197,6 +351,29 @@ def create_ui():
                                                         placeholder="https://www.coindesk.com/...\nhttps://cointelegraph.com/...")
                             targeted_crawl_button = gr.Button("开始精准爬取", variant="primary")
 
+                    with gr.TabItem("情绪趋势"):
+                        with gr.Group():
+                            gr.Markdown("### 历史情绪走势")
+                            trend_key_input = gr.Dropdown(label="币种或关键词",
+                                                          choices=sorted(set(PRESET_COINS) | set(sentiment_series.keys())),
+                                                          value=PRESET_COINS[0], allow_custom_value=True)
+                            trend_granularity_input = gr.Radio(label="聚合粒度", choices=["按小时", "按天"], value="按天")
+                            trend_days_input = gr.Number(label="最近天数", value=30, minimum=1, step=1)
+                            trend_button = gr.Button("查询趋势", variant="primary")
+                        trend_info_output = gr.Markdown()
+                        trend_chart_output = gr.Plot(label="情绪趋势")
+
+                    with gr.TabItem("本地语料检索"):
+                        with gr.Group():
+                            gr.Markdown("### 检索已爬取的文章")
+                            index_query_input = gr.Textbox(label="检索关键词", placeholder="例如：ETH ETF")
+                            index_limit_input = gr.Number(label="返回数量", value=20, minimum=1, step=1)
+                            with gr.Row():
+                                index_search_button = gr.Button("检索", variant="primary")
+                                index_analyze_button = gr.Button("分析检索结果")
+                        index_info_output = gr.Markdown()
+                        index_results_output = gr.DataFrame(label="检索结果", interactive=False, wrap=True)
+
             with gr.Column(scale=6):
                 with gr.Group():
                     status_output = gr.Label(label="任务状态")
@@ -214,27 +391,40 @@ def create_ui():
         common_outputs = [status_output, summary_output, raw_data_output, sentiment_pie_chart, word_cloud_output,
                           analyze_button, targeted_crawl_button, *preset_buttons]
         search_inputs = [api_key_input, base_url_input, model_name_input, search_engine_input, time_period_input,
-                         query_input, search_count_input, crawl_count_input]
+                         query_input, search_count_input, crawl_count_input, llm_sentiment_input]
         analyze_button.click(fn=search_and_crawl_flow, inputs=search_inputs, outputs=common_outputs)
 
         def create_preset_handler(coin: str) -> Callable[..., Generator[Any, None, None]]:
-            def handler(api_key, base_url, model_name, search_engines, time_period, search_count, crawl_count):
+            def handler(api_key, base_url, model_name, search_engines, time_period, search_count, crawl_count,
+                        llm_sentiment):
                 yield from search_and_crawl_flow(
                     api_key=api_key, base_url=base_url, model_name=model_name,
                     search_engine_names=search_engines, time_period=time_period,
                     query=f"{coin} 最新新闻", search_count=search_count,
-                    crawl_count=crawl_count, is_direct_crawl=True
+                    crawl_count=crawl_count, llm_sentiment=llm_sentiment, is_direct_crawl=True
                 )
 
             return handler
 
         preset_inputs = [api_key_input, base_url_input, model_name_input, search_engine_input, time_period_input,
-                         search_count_input, crawl_count_input]
+                         search_count_input, crawl_count_input, llm_sentiment_input]
         for i, coin_button in enumerate(preset_buttons):
             handler_fn = create_preset_handler(PRESET_COINS[i])
             coin_button.click(fn=handler_fn, inputs=preset_inputs, outputs=common_outputs)
 
-        targeted_inputs = [api_key_input, base_url_input, model_name_input, url_list_input]
+        targeted_inputs = [api_key_input, base_url_input, model_name_input, url_list_input, llm_sentiment_input]
         targeted_crawl_button.click(fn=targeted_crawl_flow, inputs=targeted_inputs, outputs=common_outputs)
 
+        trend_button.click(fn=sentiment_trend_flow,
+                           inputs=[trend_key_input, trend_granularity_input, trend_days_input],
+                           outputs=[trend_chart_output, trend_info_output])
+
+        index_search_button.click(fn=index_search_flow, inputs=[index_query_input, index_limit_input],
+                                  outputs=[index_results_output, index_info_output], api_name="search_index")
+
+        index_analyze_button.click(fn=index_analysis_flow,
+                                   inputs=[api_key_input, base_url_input, model_name_input, index_query_input,
+                                           index_limit_input],
+                                   outputs=common_outputs)
+
     return iface
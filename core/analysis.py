@@ -1,15 +1,15 @@
 # core/analysis.py
-import jieba
-from wordcloud import WordCloud
-import matplotlib
-
-# Use a backend that doesn't require a GUI
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
 import numpy as np
 import os
+import re
 import logging
-from typing import List, Dict, Optional
+from collections import Counter
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple, Pattern, TYPE_CHECKING
+
+# jieba / wordcloud / matplotlib 导入代价较高，按需加载，可由 core.warmup 在后台提前预热
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
 
 # --- 情绪词典保持不变，以分析中文内容 ---
 BULLISH_WORDS = [
@@ -53,36 +53,88 @@ FINANCIAL_VOCAB = set([
 ])
 
 
+@lru_cache(maxsize=None)
+def _lexicon_patterns() -> Tuple[Tuple[Pattern, Counter], Tuple[Pattern, Counter]]:
+    """
+    将看多/看空词典各编译为一个正则，一次扫描即可完成计数。
+    词典中重复出现的词按出现次数加权，与逐词 str.count 的计分保持一致。
+    """
+    def compile_lexicon(words: List[str]) -> Tuple[Pattern, Counter]:
+        weights = Counter(word.lower() for word in words)
+        alternatives = sorted(weights, key=len, reverse=True)
+        return re.compile("|".join(re.escape(word) for word in alternatives)), weights
+
+    return compile_lexicon(BULLISH_WORDS), compile_lexicon(BEARISH_WORDS)
+
+
+def _count_lexicon_hits(text: str) -> Tuple[int, int]:
+    """统计文本中看多/看空词汇的命中次数。"""
+    text_lower = text.lower()
+    (bullish_pattern, bullish_weights), (bearish_pattern, bearish_weights) = _lexicon_patterns()
+    bullish = sum(bullish_weights[m] for m in bullish_pattern.findall(text_lower))
+    bearish = sum(bearish_weights[m] for m in bearish_pattern.findall(text_lower))
+    return bullish, bearish
+
+
+@lru_cache(maxsize=None)
+def _pyplot():
+    import matplotlib
+    # Use a backend that doesn't require a GUI
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
+
 def analyze_sentiment_simple(text: str) -> str:
     if not isinstance(text, str): return "Neutral"
-    score = 0
-    text_lower = text.lower()
-    for word in BULLISH_WORDS: score += text_lower.count(word.lower())
-    for word in BEARISH_WORDS: score -= text_lower.count(word.lower())
+    bullish, bearish = _count_lexicon_hits(text)
+    score = bullish - bearish
     if score > 0: return "Bullish"
     if score < 0: return "Bearish"
     return "Neutral"
 
 
+def score_sentiment_simple(text: str) -> float:
+    """
+    返回 [-1, 1] 区间内的数值情绪得分，符号与 analyze_sentiment_simple 的标签一致。
+    """
+    if not isinstance(text, str): return 0.0
+    bullish, bearish = _count_lexicon_hits(text)
+    total = bullish + bearish
+    return (bullish - bearish) / total if total else 0.0
+
+
+def extract_financial_terms(text: str) -> List[str]:
+    """分词并仅保留金融词汇表中的词，可在每篇文章到达时单独调用。"""
+    import jieba
+    # Use a simple split for English and jieba for Chinese context
+    word_list = jieba.cut(text.lower(), cut_all=False)
+    return [word for word in word_list if word in FINANCIAL_VOCAB and len(word) > 1]
+
+
 def generate_word_cloud(text: str, font_path: Optional[str] = None) -> Optional[np.ndarray]:
+    try:
+        filtered_words = extract_financial_terms(text)
+    except Exception as e:
+        logging.error(f"Could not generate word cloud: {e}")
+        return None
+    return generate_word_cloud_from_terms(filtered_words, font_path)
+
+
+def generate_word_cloud_from_terms(filtered_words: List[str], font_path: Optional[str] = None) -> Optional[np.ndarray]:
+    """基于已提取的金融词汇生成词云，避免对全文重复分词。"""
     if font_path and not os.path.exists(font_path):
         logging.warning(f"Font file not found: {font_path}. Using default font.")
         font_path = None
 
     try:
-        # Use a simple split for English and jieba for Chinese context
-        word_list = jieba.cut(text.lower(), cut_all=False)
-
-        filtered_words = [
-            word for word in word_list if word in FINANCIAL_VOCAB and len(word) > 1
-        ]
-
         if not filtered_words:
             logging.warning("No relevant financial vocabulary found for word cloud.")
             return None
 
         text_segmented = " ".join(filtered_words)
 
+        from wordcloud import WordCloud
         wordcloud = WordCloud(
             width=1200, height=600,
             background_color='white',
@@ -97,7 +149,7 @@ def generate_word_cloud(text: str, font_path: Optional[str] = None) -> Optional[
         return None
 
 
-def create_sentiment_pie_chart(sentiments: List[str]) -> Optional[plt.Figure]:
+def create_sentiment_pie_chart(sentiments: List[str]) -> Optional["plt.Figure"]:
     try:
         sentiment_counts: Dict[str, int] = {"Bullish": 0, "Bearish": 0, "Neutral": 0}
         for s in sentiments:
@@ -118,7 +170,7 @@ def create_sentiment_pie_chart(sentiments: List[str]) -> Optional[plt.Figure]:
             sizes.append(sentiment_counts["Neutral"]);
             colors.append('#9E9E9E')
 
-        fig, ax = plt.subplots()
+        fig, ax = _pyplot().subplots()
         if not sizes:
             ax.text(0.5, 0.5, 'No sentiment data available', ha='center', va='center')
             ax.axis('off')
@@ -131,3 +183,39 @@ def create_sentiment_pie_chart(sentiments: List[str]) -> Optional[plt.Figure]:
     except Exception as e:
         logging.error(f"Could not create pie chart: {e}")
         return None
+
+
+def create_sentiment_trend_chart(buckets: np.ndarray, means: np.ndarray, counts: np.ndarray,
+                                 title: str = "") -> Optional["plt.Figure"]:
+    """绘制情绪趋势图：折线为平均情绪得分，柱状为文章数量。"""
+    try:
+        fig, ax = _pyplot().subplots(figsize=(10, 4))
+        if len(buckets) == 0:
+            ax.text(0.5, 0.5, 'No sentiment history available', ha='center', va='center')
+            ax.axis('off')
+            return fig
+
+        times = buckets.astype(object)
+        count_ax = ax.twinx()
+        count_ax.bar(times, counts, width=0.8 * _bucket_width(buckets), color='#BBDEFB', alpha=0.6, label='Articles')
+        count_ax.set_ylabel('Articles')
+
+        ax.set_zorder(count_ax.get_zorder() + 1)
+        ax.patch.set_visible(False)
+        ax.plot(times, means, marker='o', color='#1976D2', linewidth=2, label='Mean sentiment')
+        ax.axhline(0, color='#9E9E9E', linewidth=1, linestyle='--')
+        ax.set_ylim(-1.05, 1.05)
+        ax.set_ylabel('Sentiment (-1 bearish, +1 bullish)')
+        if title: ax.set_title(title)
+        fig.autofmt_xdate()
+        fig.tight_layout()
+        return fig
+    except Exception as e:
+        logging.error(f"Could not create sentiment trend chart: {e}")
+        return None
+
+
+def _bucket_width(buckets: np.ndarray) -> float:
+    """以天为单位返回单个时间桶的宽度，供柱状图使用。"""
+    unit = np.datetime_data(buckets.dtype)[0]
+    return 1.0 / 24 if unit == 'h' else 1.0
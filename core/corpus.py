@@ -0,0 +1,91 @@
+# core/corpus.py
+import os
+import tempfile
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional
+
+
+class ArticleSummary:
+    """单篇文章在内存中保留的紧凑信息；正文本身存放在磁盘上。"""
+
+    def __init__(self, link: str, title: str, token_count: int, sentiment: str, preview: str, offset: int,
+                 length: int):
+        self.link, self.title, self.token_count, self.sentiment = link, title, token_count, sentiment
+        self.preview, self.offset, self.length = preview, offset, length
+
+
+class ArticleCorpus:
+    """
+    任务级的流式语料库：文章正文追加写入临时文件，内存中只保留摘要信息（token数、情绪、截断预览），
+    下游通过迭代器逐篇读取正文，内存占用不随爬取规模增长。
+    """
+
+    def __init__(self, spill_dir: Optional[str] = None, preview_length: int = 150):
+        self.preview_length = preview_length
+        self._file = tempfile.TemporaryFile(prefix="corpus_", dir=spill_dir)
+        self._lock = threading.Lock()
+        self._summaries: Dict[str, ArticleSummary] = {}
+
+    def add(self, link: str, title: str, text: str, sentiment: str = "", token_count: int = 0) -> ArticleSummary:
+        """写入一篇文章正文并返回其摘要；同一链接重复写入时以最新内容为准。"""
+        data = text.encode('utf-8')
+        with self._lock:
+            self._file.seek(0, os.SEEK_END)
+            offset = self._file.tell()
+            self._file.write(data)
+            preview = text[:self.preview_length] + ('...' if len(text) > self.preview_length else '')
+            summary = ArticleSummary(link, title, token_count, sentiment, preview, offset, len(data))
+            self._summaries[link] = summary
+        return summary
+
+    def set_sentiment(self, link: str, sentiment: str) -> None:
+        with self._lock:
+            if link in self._summaries: self._summaries[link].sentiment = sentiment
+
+    def text(self, link: str) -> str:
+        with self._lock:
+            summary = self._summaries[link]
+            self._file.seek(summary.offset)
+            return self._file.read(summary.length).decode('utf-8')
+
+    def iter_texts(self, links: Optional[Iterable[str]] = None) -> Iterator[str]:
+        """按写入顺序（或给定链接顺序）逐篇返回正文。"""
+        for link in (list(links) if links is not None else self.links()):
+            if link in self._summaries: yield self.text(link)
+
+    def links(self) -> List[str]:
+        with self._lock:
+            return list(self._summaries)
+
+    def summaries(self) -> List[ArticleSummary]:
+        with self._lock:
+            return list(self._summaries.values())
+
+    def __contains__(self, link: object) -> bool:
+        return link in self._summaries
+
+    def __len__(self) -> int:
+        return len(self._summaries)
+
+    def close(self) -> None:
+        """关闭并删除临时文件。"""
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self) -> "ArticleCorpus":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def take_chars(texts: Iterable[str], max_chars: int, separator: str = "\n") -> str:
+    """从文本迭代器中依次拼接，总长度达到 max_chars 即停止读取后续文本。"""
+    parts: List[str] = []
+    remaining = max_chars
+    for text in texts:
+        if remaining <= 0: break
+        piece = text[:remaining]
+        parts.append(piece)
+        remaining -= len(piece) + len(separator)
+    return separator.join(parts)
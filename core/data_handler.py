@@ -1,9 +1,11 @@
 # core/data_handler.py
+import csv
 import pandas as pd
 import logging
 import os
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Optional
+from core.corpus import ArticleCorpus
 
 
 class DataHandler:
@@ -17,21 +19,34 @@ class DataHandler:
         except OSError as e:
             logging.error(f"创建输出目录 {self.output_dir} 失败: {e}")
 
-    def save_to_csv(self, data: List[Dict], query: str) -> None:
-        """将数据安全地保存到CSV文件。"""
+    def save_to_csv(self, data: List[Dict], query: str, corpus: Optional[ArticleCorpus] = None,
+                    content_column: str = "爬取内容") -> None:
+        """
+        将数据安全地保存到CSV文件。
+        传入 corpus 时逐行写出，content_column 列从语料库中按“链接”读取完整正文，不在内存中汇总全部正文。
+        """
         if not data:
             logging.warning("无数据可保存。")
             return
 
         try:
-            df = pd.DataFrame(data)
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             # 清理查询词作为文件名，避免非法字符
             safe_query = "".join(c for c in query if c.isalnum() or c in (' ', '_')).rstrip()
             filename = f"{safe_query}_{timestamp}.csv"
             filepath = os.path.join(self.output_dir, filename)
 
-            df.to_csv(filepath, index=False, encoding='utf-8-sig')
+            if corpus is None:
+                pd.DataFrame(data).to_csv(filepath, index=False, encoding='utf-8-sig')
+            else:
+                with open(filepath, 'w', newline='', encoding='utf-8-sig') as f:
+                    writer = csv.DictWriter(f, fieldnames=list(data[0].keys()))
+                    writer.writeheader()
+                    for row in data:
+                        link = row.get("链接")
+                        if link in corpus:
+                            row = {**row, content_column: corpus.text(link)}
+                        writer.writerow(row)
             logging.info(f"数据成功保存到 {filepath}")
         except Exception as e:
             logging.error(f"保存数据到CSV失败: {e}")
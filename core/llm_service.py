@@ -1,31 +1,70 @@
 # core/llm_service.py
-import openai
+import hashlib
+import json
 import logging
-from typing import Optional
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple, Union, TYPE_CHECKING
+
+from core.analysis import analyze_sentiment_simple, score_sentiment_simple
+from core.corpus import take_chars
+
+# openai SDK 导入较慢，仅在实际创建客户端时加载
+if TYPE_CHECKING:
+    import openai
+
+SENTIMENT_LABELS = ("Bullish", "Bearish", "Neutral")
+_LABEL_SCORES = {"Bullish": 1.0, "Bearish": -1.0, "Neutral": 0.0}
+# 打包时每篇文章附带的编号与分隔符开销（token）
+SENTIMENT_ARTICLE_OVERHEAD_TOKENS = 10
+_CJK_PATTERN = re.compile(r"[一-鿿]")
+_JSON_PATTERN = re.compile(r"\{.*\}|\[.*\]", re.DOTALL)
+
+
+def estimate_tokens(text: str) -> int:
+    """粗略估算token数：中文约每字1个token，其余字符约每4个字符1个token。"""
+    cjk = len(_CJK_PATTERN.findall(text))
+    return cjk + (len(text) - cjk) // 4 + 1
+
+
+def _lexicon_sentiment(text: str) -> Tuple[str, float]:
+    return analyze_sentiment_simple(text), score_sentiment_simple(text)
+
 
 class LLMService:
     """封装与大语言模型交互的服务。"""
+
+    # 逐篇情绪结果按 (模型, 内容哈希) 缓存，进程内所有实例共享
+    _sentiment_cache: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+    _sentiment_cache_lock = threading.Lock()
+    SENTIMENT_CACHE_SIZE = 10000
+
     def __init__(self, api_key: str, base_url: Optional[str] = None, model_name: str = "gpt-3.5-turbo"):
         self.model_name = model_name
-        self.client: Optional[openai.OpenAI] = None
+        self.client: Optional["openai.OpenAI"] = None
         if not api_key or api_key == "YOUR_API_KEY_HERE":
             logging.warning("LLMService: API key is missing or a placeholder.")
             return
         try:
+            import openai
             self.client = openai.OpenAI(api_key=api_key, base_url=base_url)
             logging.info(f"LLMService initialized for model '{model_name}'")
         except Exception as e:
             logging.error(f"Failed to initialize OpenAI client: {e}")
 
-    def summarize_news(self, content: str, query: str) -> str:
-        """使用LLM分析和总结新闻内容。"""
+    def summarize_news(self, content: Union[str, Iterable[str]], query: str) -> str:
+        """使用LLM分析和总结新闻内容；content 可以是完整文本，也可以是逐篇文章的迭代器。"""
         if not self.client: return "错误：LLM客户端未正确初始化（请检查API Key）。"
-        if not content: return "错误：输入内容为空，无法进行总结。"
 
-        # 截断过长内容以避免超出token限制
+        # 截断过长内容以避免超出token限制；迭代器输入只读取到上限为止
         max_content_length = 15000
-        if len(content) > max_content_length:
+        if isinstance(content, str):
             content = content[:max_content_length]
+        else:
+            content = take_chars(content, max_content_length)
+        if not content: return "错误：输入内容为空，无法进行总结。"
 
         system_prompt = "你是一个专业的Web3行业分析师。你的任务是基于提供的网络搜索结果，为用户提供一个关于特定主题的、简洁、中立、有条理的新闻总结。"
         user_prompt = f"""
@@ -39,6 +78,7 @@ class LLMService:
         {content}
         ---
         """
+        import openai
         try:
             response = self.client.chat.completions.create(
                 model=self.model_name,
@@ -56,3 +96,122 @@ class LLMService:
         except Exception as e:
             logging.error(f"An unexpected error occurred during LLM call: {e}")
             return f"错误：调用LLM时发生未知错误。"
+
+    def classify_sentiments(self, texts: List[str], token_budget: int = 10000, max_article_chars: int = 400,
+                            max_workers: int = 4) -> List[Tuple[str, float]]:
+        """
+        批量判断多篇文章的情绪，返回与输入顺序一致的 (标签, [-1, 1] 得分) 列表。
+        每篇只截取前 max_article_chars 个字符，在token预算内打包进同一请求（默认值下约20篇中文摘录一个请求），
+        多个请求并发发送；命中缓存的文章不再请求，未能解析出结果的文章回退到词典评分。
+        """
+        results: List[Optional[Tuple[str, float]]] = [None] * len(texts)
+        pending: List[Tuple[int, str, str]] = []
+        for i, text in enumerate(texts):
+            key = self._sentiment_cache_key(text)
+            cached = self._cache_get(key)
+            if cached:
+                results[i] = cached
+            elif self.client and text:
+                pending.append((i, key, text[:max_article_chars]))
+
+        batches = self._pack_batches(pending, token_budget)
+        if batches:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(batches))) as executor:
+                for batch, parsed in zip(batches, executor.map(self._classify_batch, batches)):
+                    for local_id, (i, key, _) in enumerate(batch, start=1):
+                        if local_id in parsed:
+                            results[i] = parsed[local_id]
+                            self._cache_put(key, parsed[local_id])
+
+        fallback_count = sum(1 for r in results if r is None)
+        if fallback_count and self.client:
+            logging.warning(f"{fallback_count} 篇文章未获得大模型情绪结果，已回退到词典评分。")
+        return [r if r is not None else _lexicon_sentiment(texts[i]) for i, r in enumerate(results)]
+
+    @staticmethod
+    def _pack_batches(items: List[Tuple[int, str, str]], token_budget: int) -> List[List[Tuple[int, str, str]]]:
+        """按token预算将文章贪心装箱；单篇超出预算时独占一个请求。"""
+        batches: List[List[Tuple[int, str, str]]] = []
+        current: List[Tuple[int, str, str]] = []
+        used = 0
+        for item in items:
+            cost = estimate_tokens(item[2]) + SENTIMENT_ARTICLE_OVERHEAD_TOKENS
+            if current and used + cost > token_budget:
+                batches.append(current)
+                current, used = [], 0
+            current.append(item)
+            used += cost
+        if current: batches.append(current)
+        return batches
+
+    def _classify_batch(self, batch: List[Tuple[int, str, str]]) -> Dict[int, Tuple[str, float]]:
+        """发送一个打包请求，返回 {批内编号: (标签, 得分)}；请求或解析失败时返回空字典。"""
+        articles = "\n\n".join(f"[{local_id}]\n{text}" for local_id, (_, _, text) in enumerate(batch, start=1))
+        system_prompt = "你是一个专业的加密货币市场情绪分析师，只输出JSON。"
+        user_prompt = f"""
+        请判断以下每篇新闻对相关加密资产价格的情绪倾向。
+        要求:
+        1. label 只能是 "Bullish"、"Bearish" 或 "Neutral"。
+        2. score 为 -1 到 1 之间的数值，-1 表示极度看空，1 表示极度看多。
+        3. 为每个编号各输出一条结果，格式为：{{"results": [{{"id": 1, "label": "Bullish", "score": 0.6}}]}}
+        新闻列表：
+        ---
+        {articles}
+        ---
+        """
+        import openai
+        try:
+            response = self.client.chat.completions.create(
+                model=self.model_name,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ],
+                temperature=0, max_tokens=40 * len(batch) + 50,
+            )
+            return self._parse_sentiment_response(response.choices[0].message.content or "", len(batch))
+        except openai.APIError as e:
+            logging.error(f"OpenAI API Error during sentiment classification: {e}")
+        except Exception as e:
+            logging.error(f"An unexpected error occurred during LLM sentiment classification: {e}")
+        return {}
+
+    @staticmethod
+    def _parse_sentiment_response(content: str, batch_size: int) -> Dict[int, Tuple[str, float]]:
+        match = _JSON_PATTERN.search(content)
+        if not match: return {}
+        try:
+            data = json.loads(match.group())
+        except json.JSONDecodeError:
+            logging.warning("LLM sentiment response is not valid JSON.")
+            return {}
+        items = data.get("results", []) if isinstance(data, dict) else data
+        parsed: Dict[int, Tuple[str, float]] = {}
+        for item in items if isinstance(items, list) else []:
+            try:
+                local_id = int(item["id"])
+                label = str(item["label"]).strip().capitalize()
+                if label not in SENTIMENT_LABELS or not 1 <= local_id <= batch_size: continue
+                score = float(item.get("score", _LABEL_SCORES[label]))
+                parsed[local_id] = (label, max(-1.0, min(1.0, score)))
+            except (KeyError, TypeError, ValueError, AttributeError):
+                continue
+        return parsed
+
+    def _sentiment_cache_key(self, text: str) -> str:
+        return f"{self.model_name}:{hashlib.sha256(text.encode('utf-8')).hexdigest()}"
+
+    @classmethod
+    def _cache_get(cls, key: str) -> Optional[Tuple[str, float]]:
+        with cls._sentiment_cache_lock:
+            value = cls._sentiment_cache.get(key)
+            if value is not None: cls._sentiment_cache.move_to_end(key)
+            return value
+
+    @classmethod
+    def _cache_put(cls, key: str, value: Tuple[str, float]) -> None:
+        with cls._sentiment_cache_lock:
+            cls._sentiment_cache[key] = value
+            cls._sentiment_cache.move_to_end(key)
+            while len(cls._sentiment_cache) > cls.SENTIMENT_CACHE_SIZE:
+                cls._sentiment_cache.popitem(last=False)
@@ -1,7 +1,7 @@
 # core/output_formatter.py
 from .search_engine import SearchResult
 import pandas as pd
-from typing import List
+from typing import List, Dict
 
 
 def format_summary_for_display(summary: str, crawled_links: List[str]) -> str:
@@ -17,20 +17,45 @@ def format_summary_for_display(summary: str, crawled_links: List[str]) -> str:
     return f"{header}{summary}{links_header}{links_body}"
 
 
+DISPLAY_HEADERS = ["序号", "标题", "链接", "来源", "日期", "爬取状态", "爬取内容", "情绪"]
+
+
+def build_display_record(index: int, res: SearchResult) -> Dict:
+    """为单条搜索结果构建一行表格数据，供流式任务逐条追加。"""
+    return {
+        "序号": index + 1,
+        "标题": res.title, "链接": res.link, "来源": res.source,
+        "日期": res.to_dict()['date'], "爬取状态": "待处理", "爬取内容": "", "情绪": "待分析"
+    }
+
+
 def format_raw_data_for_display(search_results: List[SearchResult]) -> pd.DataFrame:
     """
     更新DataFrame结构，增加“序号”列。
     """
-    headers = ["序号", "标题", "链接", "来源", "日期", "爬取状态", "爬取内容", "情绪"]
     if not search_results:
-        return pd.DataFrame(columns=headers)
+        return pd.DataFrame(columns=DISPLAY_HEADERS)
+
+    data_for_df = [build_display_record(i, res) for i, res in enumerate(search_results)]
+    return pd.DataFrame(data_for_df, columns=DISPLAY_HEADERS)
+
+
+def format_records_for_display(records: List[Dict], preview_length: int = 150) -> pd.DataFrame:
+    """将表格行转换为DataFrame，“爬取内容”列截断显示。"""
+    df = pd.DataFrame(records, columns=DISPLAY_HEADERS)
+    long_content = df['爬取内容'].str.len() > preview_length
+    df.loc[long_content, '爬取内容'] = df.loc[long_content, '爬取内容'].str.slice(0, preview_length) + '...'
+    return df
+
 
+def format_index_hits_for_display(hits: List[Dict]) -> pd.DataFrame:
+    """将本地索引的检索结果转换为与爬取结果一致的表格结构，“爬取内容”列展示命中片段。"""
     data_for_df = [
         {
             "序号": i + 1,
-            "标题": res.title, "链接": res.link, "来源": res.source,
-            "日期": res.to_dict()['date'], "爬取状态": "待处理", "爬取内容": "", "情绪": "待分析"
+            "标题": hit["title"], "链接": hit["link"], "来源": hit["source"],
+            "日期": hit["date"], "爬取状态": "本地索引", "爬取内容": hit["snippet"], "情绪": hit["sentiment"]
         }
-        for i, res in enumerate(search_results)
+        for i, hit in enumerate(hits)
     ]
-    return pd.DataFrame(data_for_df, columns=headers)
+    return pd.DataFrame(data_for_df, columns=DISPLAY_HEADERS)
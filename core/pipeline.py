@@ -0,0 +1,161 @@
+# core/pipeline.py
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Iterable, Iterator, List
+
+# 队列结束标记
+_DONE = object()
+
+
+class Pipeline:
+    """
+    由有界队列串联的流式多阶段流水线。
+
+    数据源并发产出条目，依次流经各处理阶段；每个阶段在上游产出第一个条目后即开始工作，
+    有界队列提供背压，使内存占用不随任务规模增长。各阶段通过 emit() 向调用方上报事件，
+    调用方迭代 Pipeline 即可按到达顺序消费事件，直到所有阶段完成。
+    """
+
+    def __init__(self, maxsize: int = 16):
+        self.maxsize = maxsize
+        self.events: queue.Queue = queue.Queue(maxsize)
+        self._stop = threading.Event()
+        self._sources: List[Callable[[], Iterable[Any]]] = []
+        self._stages: List[tuple] = []
+        self._threads: List[threading.Thread] = []
+
+    def source(self, fn: Callable[[], Iterable[Any]]) -> "Pipeline":
+        """添加一个数据源；多个数据源在各自线程中并发运行，输出合并到第一阶段。"""
+        self._sources.append(fn)
+        return self
+
+    def stage(self, fn: Callable[[Any], Iterable[Any]], workers: int = 1, batch_size: int = 1,
+              batch_wait: float = 0.0) -> "Pipeline":
+        """
+        添加一个处理阶段：fn 接收一个条目，返回零个或多个交给下一阶段的条目。
+        batch_size > 1 时 fn 接收条目列表：凑满 batch_size 条、上游结束，或自该批第一个条目到达起已过 batch_wait 秒时提交。
+        """
+        self._stages.append((fn, max(1, workers), max(1, batch_size), batch_wait))
+        return self
+
+    def emit(self, event: Any) -> None:
+        """供各阶段上报事件；事件队列已满时阻塞，从而对上游形成背压。"""
+        self._put(self.events, event)
+
+    def start(self) -> "Pipeline":
+        inbox: queue.Queue = queue.Queue(self.maxsize)
+        self._spawn([lambda fn=fn: self._run_source(fn, inbox) for fn in self._sources], inbox)
+        for fn, workers, batch_size, batch_wait in self._stages:
+            outbox: queue.Queue = queue.Queue(self.maxsize)
+            if batch_size > 1:
+                targets = [lambda fn=fn, i=inbox, o=outbox, n=batch_size, w=batch_wait: self._run_batch_stage(fn, i, o, n, w)
+                           for _ in range(workers)]
+            else:
+                targets = [lambda fn=fn, i=inbox, o=outbox: self._run_stage(fn, i, o) for _ in range(workers)]
+            self._spawn(targets, outbox)
+            inbox = outbox
+        self._spawn([lambda i=inbox: self._drain(i)], self.events)
+        return self
+
+    def __iter__(self) -> Iterator[Any]:
+        while True:
+            event = self._get(self.events)
+            if event is _DONE: return
+            yield event
+
+    def close(self) -> None:
+        """停止所有阶段；在调用方提前退出时释放被阻塞的线程。"""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout=1)
+
+    def _spawn(self, targets: List[Callable[[], None]], outbox: queue.Queue) -> None:
+        """启动一组线程，最后一个结束的线程向下游发送结束标记。"""
+        remaining = [len(targets)]
+        lock = threading.Lock()
+
+        def run(target: Callable[[], None]) -> None:
+            try:
+                target()
+            finally:
+                with lock:
+                    remaining[0] -= 1
+                    is_last = remaining[0] == 0
+                if is_last: self._put(outbox, _DONE)
+
+        if not targets:
+            self._put(outbox, _DONE)
+        for target in targets:
+            thread = threading.Thread(target=run, args=(target,), daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _run_source(self, fn: Callable[[], Iterable[Any]], outbox: queue.Queue) -> None:
+        try:
+            for item in fn():
+                if not self._put(outbox, item): return
+        except Exception as e:
+            logging.error(f"流水线数据源出错: {e}", exc_info=True)
+
+    def _run_stage(self, fn: Callable[[Any], Iterable[Any]], inbox: queue.Queue, outbox: queue.Queue) -> None:
+        while True:
+            item = self._get(inbox)
+            if item is _DONE:
+                self._put(inbox, _DONE)  # 通知同阶段的其他线程
+                return
+            try:
+                for output in fn(item):
+                    if not self._put(outbox, output): return
+            except Exception as e:
+                logging.error(f"流水线阶段处理出错: {e}", exc_info=True)
+
+    def _run_batch_stage(self, fn: Callable[[List[Any]], Iterable[Any]], inbox: queue.Queue, outbox: queue.Queue,
+                         batch_size: int, batch_wait: float) -> None:
+        finished = False
+        while not finished:
+            item = self._get(inbox)
+            if item is _DONE: break
+            batch = [item]
+            deadline = time.monotonic() + batch_wait
+            while len(batch) < batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    # 分片等待，以便及时响应 close()
+                    item = inbox.get(timeout=min(remaining, 0.1)) if remaining > 0 else inbox.get_nowait()
+                except queue.Empty:
+                    if remaining > 0 and not self._stop.is_set(): continue
+                    break
+                if item is _DONE:
+                    finished = True
+                    break
+                batch.append(item)
+            if self._stop.is_set(): return
+            try:
+                for output in fn(batch):
+                    if not self._put(outbox, output): return
+            except Exception as e:
+                logging.error(f"流水线批处理阶段出错: {e}", exc_info=True)
+        self._put(inbox, _DONE)  # 通知同阶段的其他线程
+
+    def _drain(self, inbox: queue.Queue) -> None:
+        while self._get(inbox) is not _DONE:
+            pass
+
+    def _put(self, q: queue.Queue, item: Any) -> bool:
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, q: queue.Queue) -> Any:
+        while not self._stop.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _DONE
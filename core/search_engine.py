@@ -1,6 +1,9 @@
 # core/search_engine.py
+import math
 import requests
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 from urllib.parse import quote_plus
 from abc import ABC, abstractmethod
@@ -25,22 +28,59 @@ class SearchEngine(ABC):
 # --- Existing Bing and Google classes remain the same ---
 class BingSearch(SearchEngine):
     TIME_FILTER_MAP = {"过去24小时": "d", "过去一周": "w", "过去一月": "m"}
-    def __init__(self): super().__init__(source_name="Bing")
-    def search(self, query: str, time_period: str = "任何时间", max_results: int = 10) -> List[SearchResult]:
-        results: List[SearchResult] = []
+    PAGE_SIZE = 10  # Bing每页返回的自然结果数
+    MAX_PAGES = 10  # 单次搜索最多翻页数，避免无限翻页
+    def __init__(self):
+        super().__init__(source_name="Bing")
+        # 扩大连接池，使并发翻页可以复用同一会话的keep-alive连接
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=self.MAX_PAGES))
+    def _build_url(self, query: str, time_period: str, page: int) -> str:
         url = f"https://www.bing.com/search?q={quote_plus(query)}"
         if time_period in self.TIME_FILTER_MAP: url += f'&filters=ex1:"ez{self.TIME_FILTER_MAP[time_period]}"'
+        if page > 0: url += f"&first={page * self.PAGE_SIZE + 1}"
+        return url
+    def _fetch_page(self, url: str) -> Optional[List[SearchResult]]:
+        """抓取并解析一页结果；请求失败时返回None，以便与“该页没有结果”区分。"""
+        results: List[SearchResult] = []
         try:
             response = self.session.get(url, timeout=15)
             response.raise_for_status()
             soup = BeautifulSoup(response.text, 'html.parser')
-            for item in soup.find_all('li', class_='b_algo', limit=max_results):
+            for item in soup.find_all('li', class_='b_algo'):
                 title_tag, link_tag = item.find('h2'), item.find('a')
                 if title_tag and link_tag and link_tag.get('href'):
                     snippet_tag = item.find('div', class_='b_caption')
                     snippet = snippet_tag.get_text(strip=True) if snippet_tag else ""
                     results.append(SearchResult(title_tag.get_text(), link_tag['href'], snippet, self.source_name, datetime.now()))
-        except requests.RequestException as e: logging.error(f"Bing search failed: {e}")
+        except requests.RequestException as e:
+            logging.error(f"Bing search failed: {e}")
+            return None
+        return results
+    def search(self, query: str, time_period: str = "任何时间", max_results: int = 10) -> List[SearchResult]:
+        """
+        按所需数量计算页数并发翻页，按排名顺序合并去重；每轮只请求填补缺口所需的页数，
+        凑够 max_results 或某页成功返回但没有新结果时不再发起新的请求。请求失败的页会被跳过。
+        """
+        results: List[SearchResult] = []
+        if max_results <= 0: return results
+        seen_links = set()
+        pages_needed = min(math.ceil(max_results / self.PAGE_SIZE), self.MAX_PAGES)
+        next_page, exhausted = 0, False
+        with ThreadPoolExecutor(max_workers=pages_needed) as executor:
+            # 单页结果常少于PAGE_SIZE或与前页重复，不足时按缺口继续补一轮
+            while len(results) < max_results and next_page < self.MAX_PAGES and not exhausted:
+                wave_size = min(math.ceil((max_results - len(results)) / self.PAGE_SIZE), self.MAX_PAGES - next_page)
+                futures = [executor.submit(self._fetch_page, self._build_url(query, time_period, page))
+                           for page in range(next_page, next_page + wave_size)]
+                next_page += wave_size
+                for future in futures:
+                    page_results = future.result()
+                    if page_results is None: continue  # 请求失败，跳过该页继续合并后续页
+                    new_results = [r for r in page_results if r.link not in seen_links and not seen_links.add(r.link)]
+                    results.extend(new_results[:max_results - len(results)])
+                    if not new_results or len(results) >= max_results:
+                        exhausted = not new_results
+                        break
         return results
 
 class GoogleSearch(SearchEngine):
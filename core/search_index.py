@@ -0,0 +1,160 @@
+# core/search_index.py
+import logging
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# 中文连续片段交给jieba分词，英文/数字按单词切分
+_TOKEN_PATTERN = re.compile(r"[一-鿿]+|[a-z0-9]+(?:['._-][a-z0-9]+)*")
+_CJK_PATTERN = re.compile(r"[一-鿿]")
+# 查询时忽略的常见虚词：FTS5 中空格分隔的词按 AND 匹配，这些词会让自然语言查询无结果
+_QUERY_STOPWORDS = frozenset(
+    "a an and are as at be by did do does for from had has have how i in is it of on or our that the this to "
+    "us was we were what when where which who why will with you about any see saw "
+    "的 了 是 在 和 与 及 或 吗 呢 吧 啊 么 也 都 就 把 被 对 从 到 这 那 有 我 你 他 她 它 之 于 为 "
+    "我们 你们 他们 什么 哪些 怎么 怎样 关于 有关 看到 一下".split())
+
+
+def tokenize(text: str, for_index: bool = False) -> List[str]:
+    """
+    中英文混合分词。建索引时使用jieba的搜索引擎模式以提高召回率，查询时使用精确模式。
+    """
+    if not text: return []
+    import jieba
+    tokens: List[str] = []
+    for match in _TOKEN_PATTERN.finditer(text.lower()):
+        piece = match.group()
+        if _CJK_PATTERN.match(piece):
+            words = jieba.cut_for_search(piece) if for_index else jieba.cut(piece, cut_all=False)
+            tokens.extend(w for w in words if w.strip())
+        else:
+            tokens.append(piece)
+    return tokens
+
+
+def _query_terms(query: str) -> List[str]:
+    """将查询分词并去重，去掉常见虚词；若全部为虚词则保留原分词结果。"""
+    terms = list(dict.fromkeys(tokenize(query)))
+    return [t for t in terms if t not in _QUERY_STOPWORDS] or terms
+
+
+class ArticleIndex:
+    """
+    基于SQLite FTS5的本地全文索引，收录所有爬取成功的文章正文及其标题、链接、来源、日期和情绪。
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS articles (
+            id INTEGER PRIMARY KEY,
+            link TEXT UNIQUE NOT NULL,
+            title TEXT, source TEXT, date TEXT, sentiment TEXT, content TEXT, indexed_at TEXT
+        );
+        CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(title_tokens, body_tokens, tokenize='unicode61');
+    """
+
+    def __init__(self, output_dir: str = "output", filename: str = "article_index.db"):
+        self.db_path = os.path.join(output_dir, filename)
+        self._lock = threading.Lock()
+        self.conn: Optional[sqlite3.Connection] = None
+        try:
+            os.makedirs(output_dir, exist_ok=True)
+            self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.executescript(self.SCHEMA)
+        except sqlite3.Error as e:
+            logging.error(f"初始化文章索引 {self.db_path} 失败（需要SQLite FTS5支持）: {e}")
+            self.conn = None
+        except OSError as e:
+            logging.error(f"创建输出目录 {output_dir} 失败: {e}")
+
+    def add_article(self, link: str, title: str, source: str, date: str, sentiment: str, content: str) -> None:
+        """写入或更新一篇文章；同一链接重复爬取时以最新内容为准。"""
+        if not self.conn or not link or not content: return
+        title_tokens = " ".join(tokenize(title, for_index=True))
+        body_tokens = " ".join(tokenize(content, for_index=True))
+        try:
+            with self._lock, self.conn:
+                row = self.conn.execute("SELECT id FROM articles WHERE link = ?", (link,)).fetchone()
+                if row:
+                    self.conn.execute("DELETE FROM articles_fts WHERE rowid = ?", (row[0],))
+                    self.conn.execute(
+                        "UPDATE articles SET title=?, source=?, date=?, sentiment=?, content=?, indexed_at=? WHERE id=?",
+                        (title, source, date, sentiment, content, datetime.now().isoformat(timespec='seconds'), row[0]))
+                    rowid = row[0]
+                else:
+                    rowid = self.conn.execute(
+                        "INSERT INTO articles (link, title, source, date, sentiment, content, indexed_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (link, title, source, date, sentiment, content,
+                         datetime.now().isoformat(timespec='seconds'))).lastrowid
+                self.conn.execute("INSERT INTO articles_fts (rowid, title_tokens, body_tokens) VALUES (?, ?, ?)",
+                                  (rowid, title_tokens, body_tokens))
+        except sqlite3.Error as e:
+            logging.error(f"写入文章索引失败 ({link}): {e}")
+
+    def update_sentiment(self, link: str, sentiment: str) -> None:
+        """仅更新文章的情绪标签，无需重新分词建索引。"""
+        if not self.conn: return
+        try:
+            with self._lock, self.conn:
+                self.conn.execute("UPDATE articles SET sentiment = ? WHERE link = ?", (sentiment, link))
+        except sqlite3.Error as e:
+            logging.error(f"更新文章情绪失败 ({link}): {e}")
+
+    def search(self, query: str, limit: int = 20, snippet_length: int = 120) -> List[Dict]:
+        """按BM25相关度返回命中文章（标题权重高于正文），每条附带关键词片段。"""
+        terms = _query_terms(query)
+        if not self.conn or not terms: return []
+        quoted = ['"' + t.replace('"', '""') + '"' for t in terms]
+        try:
+            # 优先要求命中全部关键词；无结果时退化为命中任一关键词，仍按BM25排序
+            rows = self._match(" ".join(quoted), limit)
+            if not rows and len(quoted) > 1:
+                rows = self._match(" OR ".join(quoted), limit)
+        except sqlite3.Error as e:
+            logging.error(f"查询文章索引失败: {e}")
+            return []
+        return [
+            {"title": title, "link": link, "source": source, "date": date, "sentiment": sentiment,
+             "snippet": _make_snippet(content, terms, snippet_length), "score": -rank}
+            for title, link, source, date, sentiment, content, rank in rows
+        ]
+
+    def _match(self, match_expr: str, limit: int) -> List[Tuple]:
+        with self._lock:
+            return self.conn.execute(
+                "SELECT a.title, a.link, a.source, a.date, a.sentiment, a.content, "
+                "bm25(articles_fts, 2.0, 1.0) AS rank "
+                "FROM articles_fts JOIN articles a ON a.id = articles_fts.rowid "
+                "WHERE articles_fts MATCH ? ORDER BY rank LIMIT ?",
+                (match_expr, int(limit))).fetchall()
+
+    def iter_contents(self, links: List[str]) -> Iterator[Tuple[str, str]]:
+        """按给定顺序逐篇返回 (链接, 正文)，供情绪、词云和大模型环节离线复用。"""
+        if not self.conn: return
+        for link in links:
+            with self._lock:
+                row = self.conn.execute("SELECT content FROM articles WHERE link = ?", (link,)).fetchone()
+            if row: yield link, row[0]
+
+    def count(self) -> int:
+        if not self.conn: return 0
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+
+def _make_snippet(content: str, terms: List[str], length: int) -> str:
+    """截取首个命中词附近的文本，并用【】标出命中词。"""
+    if not content: return ""
+    content_lower = content.lower()
+    positions = [p for p in (content_lower.find(t) for t in terms) if p >= 0]
+    start = max(min(positions) - length // 3, 0) if positions else 0
+    snippet = content[start:start + length].replace("\n", " ")
+    pattern = re.compile("|".join(re.escape(t) for t in sorted(terms, key=len, reverse=True)), re.IGNORECASE)
+    snippet = pattern.sub(lambda m: f"【{m.group()}】", snippet)
+    prefix = "..." if start > 0 else ""
+    suffix = "..." if start + length < len(content) else ""
+    return f"{prefix}{snippet}{suffix}"
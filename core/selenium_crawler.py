@@ -1,10 +1,7 @@
 # core/selenium_crawler.py
 import logging
+import threading
 from typing import Tuple
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import WebDriverException
 from bs4 import BeautifulSoup
 import time
 # **核心改动**: 导入配置
@@ -19,6 +16,14 @@ class SeleniumCrawler:
     def __init__(self):
         # **核心改动**: 从config文件中读取路径
         self.webdriver_path = WEBDRIVER_PATH
+        # 驱动不支持并发访问；close() 也需等待进行中的提取结束后再退出浏览器
+        self._lock = threading.Lock()
+
+        # selenium 导入较慢，推迟到真正需要浏览器时再加载
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+        from selenium.webdriver.chrome.options import Options
+        from selenium.common.exceptions import WebDriverException
 
         chrome_options = Options()
         chrome_options.add_argument("--headless")
@@ -48,10 +53,13 @@ class SeleniumCrawler:
             return False, "无效的URL"
 
         try:
-            self.driver.get(url)
-            time.sleep(3)
+            with self._lock:
+                if not self.driver:
+                    return False, "WebDriver已关闭"
+                self.driver.get(url)
+                time.sleep(3)
+                page_source = self.driver.page_source
 
-            page_source = self.driver.page_source
             soup = BeautifulSoup(page_source, 'html.parser')
 
             for tag in soup(['script', 'style', 'header', 'footer', 'nav', 'aside', 'form']):
@@ -77,6 +85,8 @@ class SeleniumCrawler:
             return False, f"爬取失败: {type(e).__name__}"
 
     def close(self):
-        """关闭浏览器驱动。"""
-        if self.driver:
-            self.driver.quit()
+        """关闭浏览器驱动；若有提取正在进行，等待其完成后再退出，之后的提取请求直接返回失败。"""
+        with self._lock:
+            if self.driver:
+                self.driver.quit()
+                self.driver = None
@@ -0,0 +1,243 @@
+# core/sentiment_timeseries.py
+import csv
+import logging
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config import PRESET_COINS
+
+# 支持的聚合粒度及其对应的 numpy datetime64 单位
+GRANULARITIES: Dict[str, str] = {"hour": "h", "day": "D"}
+
+
+def normalize_series_key(query: str) -> str:
+    """
+    将搜索关键词映射为时间序列的键：命中预设币种时使用币种代码（如 "BTC 最新新闻" -> "BTC"），
+    否则使用去除首尾空白的原始关键词。
+    """
+    query = (query or "").strip()
+    for coin in PRESET_COINS:
+        if re.search(rf"(?<![A-Za-z]){re.escape(coin)}(?![A-Za-z])", query, re.IGNORECASE):
+            return coin
+    return query
+
+
+class _Rollup:
+    """单个键、单个粒度下按时间桶排序的累计值（总分与文章数），由 NumPy 数组承载。"""
+
+    def __init__(self, unit: str, buckets: Optional[np.ndarray] = None, sums: Optional[np.ndarray] = None,
+                 counts: Optional[np.ndarray] = None):
+        self.unit = unit
+        self.buckets = buckets if buckets is not None else np.empty(0, dtype=np.int64)
+        self.sums = sums if sums is not None else np.empty(0, dtype=np.float64)
+        self.counts = counts if counts is not None else np.empty(0, dtype=np.int64)
+
+    def add(self, timestamp: datetime, score: float) -> None:
+        bucket = np.datetime64(timestamp, self.unit).astype(np.int64)
+        pos = int(np.searchsorted(self.buckets, bucket))
+        if pos < len(self.buckets) and self.buckets[pos] == bucket:
+            self.sums[pos] += score
+            self.counts[pos] += 1
+        else:
+            self.buckets = np.insert(self.buckets, pos, bucket)
+            self.sums = np.insert(self.sums, pos, score)
+            self.counts = np.insert(self.counts, pos, 1)
+
+    def range(self, start: datetime, end: datetime) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        lo = int(np.searchsorted(self.buckets, np.datetime64(start, self.unit).astype(np.int64), side='left'))
+        hi = int(np.searchsorted(self.buckets, np.datetime64(end, self.unit).astype(np.int64), side='right'))
+        buckets = self.buckets[lo:hi].astype(f"datetime64[{self.unit}]")
+        counts = self.counts[lo:hi].copy()
+        means = self.sums[lo:hi] / np.maximum(counts, 1)
+        return buckets, means, counts
+
+
+class SentimentTimeSeries:
+    """
+    按币种/关键词记录逐篇文章的数值情绪，并增量维护按小时和按天的预聚合结果。
+    聚合结果保存为 .npz 文件，逐篇记录以追加方式写入 CSV，重启后无需重新评分历史数据。
+    .npz 中同时保存其已包含的日志字节数，加载时只补入之后追加的记录；无法对应时才据完整日志重建。
+    同一键下每个链接只计入一次，已记录的 (键, 链接) 存放在带主键索引的 SQLite 表中。
+    """
+
+    RECORDS_HEADER = ["key", "timestamp", "score", "link"]
+    LINKS_SCHEMA = "CREATE TABLE IF NOT EXISTS recorded_links (key TEXT, link TEXT, PRIMARY KEY (key, link)) WITHOUT ROWID"
+
+    def __init__(self, output_dir: str = "output", filename: str = "sentiment_timeseries"):
+        self.rollup_path = os.path.join(output_dir, f"{filename}.npz")
+        self.records_path = os.path.join(output_dir, f"{filename}_records.csv")
+        self.links_path = os.path.join(output_dir, f"{filename}_links.db")
+        self._rollups: Dict[str, Dict[str, _Rollup]] = {}
+        # 聚合结果已包含的记录日志字节数
+        self._records_offset = 0
+        self._lock = threading.Lock()
+        self.conn: Optional[sqlite3.Connection] = None
+        try:
+            os.makedirs(output_dir, exist_ok=True)
+        except OSError as e:
+            logging.error(f"创建输出目录 {output_dir} 失败: {e}")
+        self._load()
+
+    def record(self, key: str, score: float, timestamp: Optional[datetime] = None, link: str = "") -> None:
+        """记录一篇文章的情绪得分，并同步更新各粒度的聚合结果；该键下已记录过的链接会被忽略。"""
+        if not key: return
+        timestamp = timestamp or datetime.now()
+        with self._lock:
+            if link and not self._claim_link(key, link): return
+            self._add_to_rollups(key, timestamp, score)
+            self._append_record(key, timestamp, score, link)
+
+    def query(self, key: str, days: float = 30, granularity: str = "day",
+              now: Optional[datetime] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        返回最近 days 天内的 (时间桶, 平均情绪, 文章数)。
+        :raises ValueError: 粒度不受支持时抛出。
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"不支持的粒度: {granularity}")
+        end = now or datetime.now()
+        start = end - timedelta(days=days)
+        with self._lock:
+            rollup = self._rollups.get(key, {}).get(granularity)
+            if rollup is None:
+                empty = np.empty(0, dtype=f"datetime64[{GRANULARITIES[granularity]}]")
+                return empty, np.empty(0, dtype=np.float64), np.empty(0, dtype=np.int64)
+            return rollup.range(start, end)
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            return sorted(self._rollups)
+
+    def save(self) -> None:
+        """将聚合结果及其对应的日志位置原子地写入磁盘。"""
+        with self._lock:
+            keys = sorted(self._rollups)
+            arrays: Dict[str, np.ndarray] = {"keys": np.array(keys, dtype=str),
+                                             "records_offset": np.array(self._records_offset, dtype=np.int64)}
+            for i, key in enumerate(keys):
+                for granularity, rollup in self._rollups[key].items():
+                    # 复制一份，避免释放锁后被并发的 record() 原地修改
+                    arrays[f"{i}_{granularity}_buckets"] = rollup.buckets.copy()
+                    arrays[f"{i}_{granularity}_sums"] = rollup.sums.copy()
+                    arrays[f"{i}_{granularity}_counts"] = rollup.counts.copy()
+        tmp_path = self.rollup_path[:-len(".npz")] + ".tmp.npz"
+        try:
+            np.savez(tmp_path, **arrays)
+            os.replace(tmp_path, self.rollup_path)
+        except OSError as e:
+            logging.error(f"保存情绪时间序列失败: {e}")
+
+    def _add_to_rollups(self, key: str, timestamp: datetime, score: float) -> None:
+        rollups = self._rollups.setdefault(key, {g: _Rollup(u) for g, u in GRANULARITIES.items()})
+        for rollup in rollups.values():
+            rollup.add(timestamp, score)
+
+    def _load(self) -> None:
+        links_exist = os.path.exists(self.links_path)
+        try:
+            self.conn = sqlite3.connect(self.links_path, check_same_thread=False)
+            self.conn.execute(self.LINKS_SCHEMA)
+        except sqlite3.Error as e:
+            logging.error(f"打开已记录链接表 {self.links_path} 失败，将不再按链接去重: {e}")
+            self.conn = None
+        saved_offset = self._load_rollups()
+        if not os.path.exists(self.records_path): return
+        # 日志无法读取时沿用已加载的聚合结果，视为与现有日志一致
+        size = self._records_offset = os.path.getsize(self.records_path)
+        if saved_offset is not None and links_exist and saved_offset <= size:
+            if saved_offset == size: return
+            if self._replay_records(saved_offset): return
+        self._rebuild_from_records()
+
+    def _replay_records(self, offset: int) -> bool:
+        """将上次保存聚合结果之后追加到日志中的记录补入聚合结果；日志无法解析时返回False。"""
+        rows = self._read_records(offset)
+        if rows is None: return False
+        for key, timestamp, score, link in rows:
+            # 这些记录写入时已去重，这里只补登链接
+            self._add_to_rollups(key, timestamp, score)
+            if link: self._claim_link(key, link, commit=False)
+        if self.conn: self.conn.commit()
+        logging.info(f"已从记录日志补入 {len(rows)} 条未保存的情绪记录。")
+        self.save()
+        return True
+
+    def _rebuild_from_records(self) -> None:
+        """聚合结果缺失或与日志对应不上时，据完整日志（按键与链接去重）重建聚合结果与链接表。"""
+        rows = self._read_records(0)
+        if rows is None: return
+        self._rollups = {}
+        if self.conn: self.conn.execute("DELETE FROM recorded_links")
+        for key, timestamp, score, link in rows:
+            if link and not self._claim_link(key, link, commit=False): continue
+            self._add_to_rollups(key, timestamp, score)
+        if self.conn: self.conn.commit()
+        logging.warning(f"已据记录日志重建 {len(self._rollups)} 个情绪时间序列。")
+        self.save()
+
+    def _read_records(self, offset: int) -> Optional[List[Tuple[str, datetime, float, str]]]:
+        """读取日志中 offset 字节之后的记录并更新日志位置；无法读取时返回None。"""
+        try:
+            with open(self.records_path, 'rb') as f:
+                f.seek(offset)
+                data = f.read()
+            rows = []
+            for row in csv.reader(data.decode('utf-8').splitlines()):
+                if not row or row == self.RECORDS_HEADER: continue
+                key, timestamp, score, link = row
+                rows.append((key, datetime.fromisoformat(timestamp), float(score), link))
+        except (OSError, UnicodeDecodeError, ValueError) as e:
+            logging.error(f"读取情绪记录 {self.records_path} 失败: {e}")
+            return None
+        self._records_offset = offset + len(data)
+        return rows
+
+    def _claim_link(self, key: str, link: str, commit: bool = True) -> bool:
+        """登记 (键, 链接)；该键下已登记过该链接时返回False。链接表不可用时不去重。"""
+        if not self.conn: return True
+        try:
+            claimed = self.conn.execute("INSERT OR IGNORE INTO recorded_links (key, link) VALUES (?, ?)",
+                                        (key, link)).rowcount > 0
+            if commit: self.conn.commit()
+            return claimed
+        except sqlite3.Error as e:
+            logging.error(f"登记已记录链接失败 ({link}): {e}")
+            return True
+
+    def _load_rollups(self) -> Optional[int]:
+        """加载聚合结果，返回其对应的日志字节数；文件不存在、无法读取或为旧格式时返回None。"""
+        if not os.path.exists(self.rollup_path): return None
+        try:
+            with np.load(self.rollup_path, allow_pickle=False) as data:
+                for i, key in enumerate(data["keys"].tolist()):
+                    self._rollups[key] = {
+                        granularity: _Rollup(unit,
+                                             data[f"{i}_{granularity}_buckets"].copy(),
+                                             data[f"{i}_{granularity}_sums"].copy(),
+                                             data[f"{i}_{granularity}_counts"].copy())
+                        for granularity, unit in GRANULARITIES.items()
+                    }
+                offset = int(data["records_offset"]) if "records_offset" in data.files else None
+            logging.info(f"已加载 {len(self._rollups)} 个情绪时间序列。")
+            return offset
+        except Exception as e:
+            logging.error(f"加载情绪时间序列 {self.rollup_path} 失败: {e}")
+            self._rollups = {}
+            return None
+
+    def _append_record(self, key: str, timestamp: datetime, score: float, link: str) -> None:
+        try:
+            is_new = not os.path.exists(self.records_path)
+            with open(self.records_path, 'a', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                if is_new: writer.writerow(self.RECORDS_HEADER)
+                writer.writerow([key, timestamp.isoformat(timespec='seconds'), f"{score:.4f}", link])
+            self._records_offset = os.path.getsize(self.records_path)
+        except OSError as e:
+            logging.error(f"写入情绪记录失败: {e}")
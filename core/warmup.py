@@ -0,0 +1,87 @@
+# core/warmup.py
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+_ready = threading.Event()
+_timings: Dict[str, float] = {}
+_lock = threading.Lock()
+_thread: Optional[threading.Thread] = None
+
+
+def _warm_jieba() -> None:
+    import jieba
+    # 显式加载词典，避免首次 jieba.cut 发生在用户请求中
+    jieba.initialize()
+
+
+def _warm_lexicon() -> None:
+    from core.analysis import _lexicon_patterns, analyze_sentiment_simple
+    _lexicon_patterns()
+    analyze_sentiment_simple("warm up")
+
+
+def _warm_plotting() -> None:
+    from core.analysis import _pyplot
+    # 首次导入 pyplot 会构建 matplotlib 字体缓存
+    _pyplot()
+    import wordcloud  # noqa: F401
+
+
+def _warm_font(font_path: Optional[str]) -> None:
+    if not font_path or not os.path.exists(font_path):
+        logging.info(f"跳过字体预热，字体文件不存在: {font_path}")
+        return
+    from PIL import ImageFont
+    ImageFont.truetype(font_path, 32)
+
+
+def _warm_clients() -> None:
+    import openai  # noqa: F401
+    import selenium.webdriver  # noqa: F401
+
+
+def warm_up(font_path: Optional[str] = None) -> None:
+    """依次执行各预热步骤并记录耗时；单个步骤失败不影响其余步骤，完成后置为就绪。"""
+    steps: List[Tuple[str, Callable[[], None]]] = [
+        ("jieba", _warm_jieba),
+        ("lexicon", _warm_lexicon),
+        ("plotting", _warm_plotting),
+        ("font", lambda: _warm_font(font_path)),
+        ("clients", _warm_clients),
+    ]
+    started = time.perf_counter()
+    for name, step in steps:
+        step_started = time.perf_counter()
+        try:
+            step()
+        except Exception as e:
+            logging.warning(f"预热步骤 {name} 失败: {e}")
+        with _lock:
+            _timings[name] = time.perf_counter() - step_started
+    with _lock:
+        _timings["total"] = time.perf_counter() - started
+    _ready.set()
+    logging.info("预热完成: " + ", ".join(f"{k}={v:.2f}s" for k, v in readiness()["timings"].items()))
+
+
+def start_background_warmup(font_path: Optional[str] = None) -> threading.Thread:
+    """在后台线程中启动预热，应在服务开始监听之后调用；重复调用只会启动一次。"""
+    global _thread
+    with _lock:
+        if _thread is None:
+            _thread = threading.Thread(target=warm_up, args=(font_path,), name="warmup", daemon=True)
+            _thread.start()
+        return _thread
+
+
+def wait_until_ready(timeout: Optional[float] = None) -> bool:
+    return _ready.wait(timeout)
+
+
+def readiness() -> Dict:
+    """返回就绪状态与各预热步骤耗时（秒），供就绪探针使用。"""
+    with _lock:
+        return {"ready": _ready.is_set(), "timings": {k: round(v, 3) for k, v in _timings.items()}}
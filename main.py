@@ -1,6 +1,49 @@
 # main.py
-from app_ui import create_ui
+import time
+
+# 尽早记录启动时间，用于统计冷启动耗时
+_start_time = time.perf_counter()
+
 import logging
+import threading
+
+import gradio as gr
+import uvicorn
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+
+from app_ui import create_ui
+from config import FONT_PATH
+from core.warmup import readiness, start_background_warmup, wait_until_ready
+
+
+def create_server() -> FastAPI:
+    """在FastAPI应用上注册就绪探针，并将Gradio界面挂载到根路径。"""
+    server = FastAPI()
+
+    @server.get("/ready")
+    def ready() -> JSONResponse:
+        # 就绪探针：预热完成前返回503，完成后返回200，响应体为就绪状态与各预热步骤耗时
+        status = readiness()
+        return JSONResponse(status, status_code=200 if status["ready"] else 503)
+
+    # 自定义路由需在挂载Gradio之前注册，否则会被根路径的Gradio应用截获
+    return gr.mount_gradio_app(server, create_ui(), path="/")
+
+
+def warm_up_after_listening(server: uvicorn.Server) -> None:
+    """
+    等待uvicorn绑定端口并开始服务后，统计冷启动耗时并在后台预热分词词典、情绪词典和绘图依赖。
+    uvicorn 先执行 lifespan 启动再绑定端口，因此不能在 lifespan 中开始预热。
+    """
+    while not server.started:
+        if server.should_exit: return
+        time.sleep(0.05)
+    logging.info(f"服务已开始监听，冷启动耗时 {time.perf_counter() - _start_time:.2f}s")
+    start_background_warmup(FONT_PATH)
+    if wait_until_ready():
+        logging.info(f"预热完成，启动到就绪总耗时 {time.perf_counter() - _start_time:.2f}s")
+
 
 if __name__ == "__main__":
     # 配置全局日志记录器
@@ -12,5 +55,6 @@ if __name__ == "__main__":
     print("正在启动Web3新闻分析器...")
     print("请在浏览器中打开 http://127.0.0.1:7860")
 
-    app = create_ui()
-    app.launch()
\ No newline at end of file
+    server = uvicorn.Server(uvicorn.Config(create_server(), host="127.0.0.1", port=7860))
+    threading.Thread(target=warm_up_after_listening, args=(server,), name="warmup-trigger", daemon=True).start()
+    server.run()